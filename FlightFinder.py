@@ -1,28 +1,80 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import customtkinter as ctk
-from bs4 import BeautifulSoup
-from collections import defaultdict, deque
-import heapq
+from lxml import etree
+from numba import njit
+import numpy as np
 import requests
+import sys
 import threading
 
 
 class RouteGraph:
     """Graph structure storing UPSVAC airline routes.
 
-    The graph is represented as an adjacency list:
-        - Each key is a departure airport code.
-        - Each value is a list of route dictionaries, where each dictionary
-          represents a flight from the departure airport with:
-            - dest (str): Destination airport code
-            - aircraft (str): Aircraft type operating the flight
-            - distance (int): Distance in nautical miles
+    Airport codes and aircraft types are mapped to dense integer ids (0..n-1)
+    so the pathfinders can use plain lists instead of hashing strings:
+        - airports / airport_ids: id -> airport code and airport code -> id
+        - aircraft_types / aircraft_ids: id -> aircraft type and aircraft type -> id
+
+    The graph is represented as an adjacency list per aircraft in ``by_aircraft``,
+    mapping aircraft id -> departure airport id -> list of (dest_id, distance) tuples,
+    with the distance in nautical miles, so the pathfinders only walk the flights the
+    selected aircraft can operate. ``edge_weight`` maps (dep_id, dest_id, aircraft_id)
+    to the shortest distance flown between the two airports with that aircraft.
+    ``csr`` flattens one aircraft's routes into NumPy arrays for the compiled
+    search kernels, and ``reverse_csr`` does the same for incoming routes.
+    ``search_tree`` keeps the least-distance trees of recently queried departures.
 
     Provides methods to add routes to the graph structure.
     """
 
+    TREE_CACHE_SIZE = 64
+
     def __init__(self)-> None:
-        """Initialize an empty graph using defaultdict(list)."""
-        self.graph = defaultdict(list)
+        """Initialize an empty graph with no airports or aircraft."""
+        self.airports: list[str] = []
+        self.airport_ids: dict[str, int] = {}
+        self.aircraft_types: list[str] = []
+        self.aircraft_ids: dict[str, int] = {}
+        self.edge_weight: dict[tuple[int, int, int], int] = {}
+        self.by_aircraft: list[list[list[tuple[int, int]]]] = []
+        self._csr: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._rev_csr: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._trees: OrderedDict[tuple[int, int], tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    def airport_id(self, code: str) -> int:
+        """Return the id for an airport code, assigning the next free id if it is new.
+
+        Args:
+            code (str): Airport code.
+
+        Returns:
+            int: Dense id of the airport.
+        """
+        airport_id = self.airport_ids.get(code)
+        if airport_id is None:
+            airport_id = self.airport_ids[code] = len(self.airports)
+            self.airports.append(code)
+            for routes in self.by_aircraft:
+                routes.append([])
+        return airport_id
+
+    def aircraft_id(self, aircraft: str) -> int:
+        """Return the id for an aircraft type, assigning the next free id if it is new.
+
+        Args:
+            aircraft (str): Aircraft type.
+
+        Returns:
+            int: Dense id of the aircraft type.
+        """
+        aircraft_id = self.aircraft_ids.get(aircraft)
+        if aircraft_id is None:
+            aircraft_id = self.aircraft_ids[aircraft] = len(self.aircraft_types)
+            self.aircraft_types.append(aircraft)
+            self.by_aircraft.append([[] for _ in self.airports])
+        return aircraft_id
 
     def add_route(self, dep: str, dest: str, aircraft: str, distance: int) -> None:
         """Add a route to the graph structure from departure to destination with aircraft and distance.
@@ -33,173 +85,570 @@ class RouteGraph:
             aircraft (str): Aircraft type operating this route.
             distance (int): Distance in nautical miles.
         """
-        self.graph[dep].append({
-            "dest": dest,
-            "aircraft": aircraft,
-            "distance": distance
-        })
+        dep_id = self.airport_id(dep)
+        dest_id = self.airport_id(dest)
+        aircraft_id = self.aircraft_id(aircraft)
+        key = (dep_id, dest_id, aircraft_id)
+        self.edge_weight[key] = min(distance, self.edge_weight.get(key, distance))
+        self.by_aircraft[aircraft_id][dep_id].append((dest_id, distance))
+        self._csr.pop(aircraft_id, None)
+        self._rev_csr.pop(aircraft_id, None)
+        self._trees.clear()
+
+    def csr(self, aircraft: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the routes of one aircraft type in CSR (compressed sparse row) form.
+
+        The routes leaving airport v are adj_dest[adj_idx[v]:adj_idx[v+1]], with
+        matching distances in adj_dist. Arrays are built on first use and cached
+        until another route is added for the aircraft.
+
+        Args:
+            aircraft (int): Aircraft type id.
 
-def fewest_legs(graph: RouteGraph, start: str, end: str, aircraft: str) -> list[str] | None:
-    """Compute the route with the fewest legs using BFS (Breadth-First Search).
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (adj_idx, adj_dest, adj_dist)
+            as int64 arrays.
+        """
+        arrays = self._csr.get(aircraft)
+        if arrays is None:
+            routes = self.by_aircraft[aircraft]
+            adj_idx = np.zeros(len(self.airports) + 1, dtype=np.int64)
+            adj_idx[1:] = np.cumsum([len(r) for r in routes])
+            adj_dest = np.array([dest for r in routes for dest, _ in r], dtype=np.int64)
+            adj_dist = np.array([distance for r in routes for _, distance in r], dtype=np.int64)
+            arrays = self._csr[aircraft] = (adj_idx, adj_dest, adj_dist)
+        return arrays
+
+    def reverse_csr(self, aircraft: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the incoming routes of one aircraft type in CSR form.
+
+        The airports with a route arriving at airport v are rev_src[rev_idx[v]:rev_idx[v+1]],
+        with matching distances in rev_dist. Arrays are built on first use and cached like ``csr``.
 
-    BFS ensures the first path found to the destination is the one with the
-    fewest number of flights (edges) because it explores all nodes at the
-    current depth before moving deeper.
+        Args:
+            aircraft (int): Aircraft type id.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (rev_idx, rev_src, rev_dist) as int64 arrays.
+        """
+        arrays = self._rev_csr.get(aircraft)
+        if arrays is None:
+            arrays = self._rev_csr[aircraft] = invert_csr(*self.csr(aircraft))
+        return arrays
+
+    def search_tree(self, aircraft: int, start: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the full least-distance search tree from a departure airport.
+
+        Trees are cached per (aircraft, start) so any later query from the same airport
+        only has to walk them. The least recently used tree is dropped once more than
+        TREE_CACHE_SIZE are stored.
+
+        Args:
+            aircraft (int): Aircraft type id.
+            start (int): Starting airport id.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (best_dist, prev) where best_dist holds the
+            least distance to each airport (_INF if unreachable) and prev the airport it
+            is reached from on that route.
+        """
+        key = (aircraft, start)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+
+        adj_idx, adj_dest, adj_dist = self.csr(aircraft)
+        tree = self._trees[key] = _dijkstra(adj_idx, adj_dest, adj_dist, start, len(adj_idx) - 1)
+        if len(self._trees) > self.TREE_CACHE_SIZE:
+            self._trees.popitem(last=False)
+        return tree
+
+def invert_csr(adj_idx: np.ndarray, adj_dest: np.ndarray, adj_dist: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Turn CSR arrays of outgoing routes into CSR arrays of incoming routes.
 
     Args:
-        graph (RouteGraph): The graph containing all routes.
-        start (str): Starting airport code.
-        end (str): Destination airport code.
-        aircraft (str): Aircraft type to filter flights.
+        adj_idx (np.ndarray): Row offsets, routes leaving v are adj_idx[v]:adj_idx[v+1].
+        adj_dest (np.ndarray): Destination of each route.
+        adj_dist (np.ndarray): Distance of each route.
 
     Returns:
-        List[str] | None: Sequence of airport codes representing the path, or
-        None if no route exists.
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (rev_idx, rev_src, rev_dist) as int64 arrays.
     """
-    # Queue holds tuples of (current airport, path taken to reach it)
-    queue = deque([(start, [start])])
-    
-    ## This set tracks visited airports to prevent cycles and redundant processing.
-    visited = set()
-
-    # dequeu is a lot quicker than using a list for BFS, as it allows O(1) pops from the front.
-    while queue:
-        airport, path = queue.popleft()
-
-        # If destination reached, return immediately with the path, as BFS guarantees it's the shortest in terms of legs.
-        if airport == end:
-            return path
-
-        # Skip airports we've already fully explored to avoid cycles and redundant paths.
-        if airport in visited:
-            continue
-        visited.add(airport)
+    n = len(adj_idx) - 1
+
+    # Departure of every route, then regroup the routes by destination
+    adj_src = np.repeat(np.arange(n, dtype=np.int64), np.diff(adj_idx))
+    order = np.argsort(adj_dest, kind="stable")
+    rev_idx = np.zeros(n + 1, dtype=np.int64)
+    rev_idx[1:] = np.cumsum(np.bincount(adj_dest, minlength=n))
+    return rev_idx, adj_src[order], adj_dist[order]
+
 
-        # Explore other routes from current airport that match the aircraft type
-        for edge in graph.graph[airport]:
-            if edge["aircraft"] != aircraft:
+def reconstruct_path(parent: list[int], end: int) -> list[int]:
+    """Rebuild a path by following predecessor links back from the destination.
+
+    Args:
+        parent (list[int]): Maps each reached airport id to the airport id it was
+            reached from. The starting airport maps to -1.
+        end (int): Destination airport id.
+
+    Returns:
+        list[int]: Sequence of airport ids from the start to the destination.
+    """
+    path = []
+    airport = end
+    while airport != -1:
+        path.append(airport)
+        airport = parent[airport]
+    path.reverse()
+    return path
+
+
+# Dijkstra heap entries are packed into one int64 as (dist << 40 | hops << 20 | airport),
+# so ordering the ints orders by distance, then hops, then airport like the tuples did.
+_NODE_BITS = 20
+_HOPS_BITS = 20
+_NODE_MASK = (1 << _NODE_BITS) - 1
+_HOPS_MASK = (1 << _HOPS_BITS) - 1
+_DIST_SHIFT = _NODE_BITS + _HOPS_BITS
+_INF = np.iinfo(np.int64).max
+
+# Numba can only cache compiled kernels next to a .py source file. Frozen builds (FlightFinder.exe)
+# ship bytecode only and would have to recompile for several seconds on every launch, which is far
+# more than the searches cost on a graph this size, so there the kernels run as plain Python.
+_CACHE_KERNELS = not getattr(sys, "frozen", False) and __file__.endswith(".py")
+
+
+def _kernel(**options):
+    """Compile a search kernel with Numba when the result can be cached, otherwise leave it as plain Python."""
+    if _CACHE_KERNELS:
+        return njit(cache=True, **options)
+    return lambda func: func
+
+
+@_kernel()
+def _sift_up4(heap, pos, i, key):
+    """Place key at slot i of a 4-ary min-heap and sift it up, keeping pos[airport] in sync.
+
+    Used both to push (i = current size) and to decrease an airport's key in place.
+    """
+    while i > 0:
+        parent = (i - 1) >> 2
+        if heap[parent] <= key:
+            break
+        heap[i] = heap[parent]
+        pos[heap[i] & _NODE_MASK] = i
+        i = parent
+    heap[i] = key
+    pos[key & _NODE_MASK] = i
+
+
+@_kernel()
+def _pop4(heap, pos, size):
+    """Pop the smallest key from a 4-ary min-heap stored in heap[:size]. Returns (key, new size)."""
+    top = heap[0]
+    pos[top & _NODE_MASK] = -1
+    size -= 1
+    if size == 0:
+        return top, size
+
+    key = heap[size]
+    i = 0
+    while True:
+        # Children of i are 4i+1 .. 4i+4, pick the smallest one that exists
+        first = 4 * i + 1
+        if first >= size:
+            break
+        smallest = first
+        for c in range(first + 1, min(first + 4, size)):
+            if heap[c] < heap[smallest]:
+                smallest = c
+        if heap[smallest] >= key:
+            break
+        heap[i] = heap[smallest]
+        pos[heap[i] & _NODE_MASK] = i
+        i = smallest
+    heap[i] = key
+    pos[key & _NODE_MASK] = i
+    return top, size
+
+
+@_kernel()
+def _expand(adj_idx, adj_dest, front, size, out, dist, link, other_dist):
+    """Expand one BFS level from front[:size] into out.
+
+    Records dist and link (the airport each new one was reached from) for newly found
+    airports. Returns (new size, meeting airport or -1), where the meeting airport is the
+    one already reached by the other search with the fewest total legs.
+    """
+    new_size = 0
+    meet = -1
+    best = _INF
+    for i in range(size):
+        airport = front[i]
+        for e in range(adj_idx[airport], adj_idx[airport + 1]):
+            nxt = adj_dest[e]
+            if dist[nxt] != -1:
+                continue
+            dist[nxt] = dist[airport] + 1
+            link[nxt] = airport
+            out[new_size] = nxt
+            new_size += 1
+            if other_dist[nxt] != -1 and dist[nxt] + other_dist[nxt] < best:
+                best = dist[nxt] + other_dist[nxt]
+                meet = nxt
+    return new_size, meet
+
+
+@_kernel(nogil=True)
+def _bfs_tree(adj_idx, adj_dest, root, n):
+    """Compiled full BFS from root over CSR arrays. Returns link, where link[v] is the airport v was reached from."""
+    dist = np.full(n, -1, dtype=np.int64)
+    link = np.full(n, -1, dtype=np.int64)
+    front = np.empty(n, dtype=np.int64)
+    spare = np.empty(n, dtype=np.int64)
+    unreached = np.full(n, -1, dtype=np.int64)
+
+    dist[root] = 0
+    front[0] = root
+    size = 1
+    while size > 0:
+        size, _ = _expand(adj_idx, adj_dest, front, size, spare, dist, link, unreached)
+        front, spare = spare, front
+    return link
+
+
+@_kernel()
+def _bfs(adj_idx, adj_dest, rev_idx, rev_src, start, end, n):
+    """Compiled bidirectional BFS over CSR arrays.
+
+    Returns (meet, parent, child): parent[v] is the airport v was reached from going
+    forward from start, child[v] the next airport towards end found going backward.
+    meet is -1 if end is unreachable.
+    """
+    parent = np.full(n, -1, dtype=np.int64)
+    child = np.full(n, -1, dtype=np.int64)
+    if start == end:
+        return start, parent, child
+
+    dist_f = np.full(n, -1, dtype=np.int64)
+    dist_b = np.full(n, -1, dtype=np.int64)
+    dist_f[start] = 0
+    dist_b[end] = 0
+
+    # Every airport joins a frontier at most once per side, so flat arrays are enough
+    front_f = np.empty(n, dtype=np.int64)
+    front_b = np.empty(n, dtype=np.int64)
+    spare = np.empty(n, dtype=np.int64)
+    front_f[0] = start
+    front_b[0] = end
+    size_f = 1
+    size_b = 1
+
+    # Expand whole levels of the smaller frontier until the two searches meet
+    while size_f > 0 and size_b > 0:
+        if size_f <= size_b:
+            size_f, meet = _expand(adj_idx, adj_dest, front_f, size_f, spare, dist_f, parent, dist_b)
+            front_f, spare = spare, front_f
+        else:
+            size_b, meet = _expand(rev_idx, rev_src, front_b, size_b, spare, dist_b, child, dist_f)
+            front_b, spare = spare, front_b
+        if meet != -1:
+            return meet, parent, child
+
+    return -1, parent, child
+
+
+@_kernel()
+def _dijkstra(adj_idx, adj_dest, adj_dist, start, n):
+    """Compiled Dijkstra over CSR arrays, building the full shortest-path tree from start.
+
+    Returns (best_dist, prev), with best_dist[v] = _INF for airports that are unreachable.
+    """
+    prev = np.full(n, -1, dtype=np.int64)
+    best_dist = np.full(n, _INF, dtype=np.int64)
+    best_hops = np.zeros(n, dtype=np.int64)
+    best_dist[start] = 0
+
+    # Indexed 4-ary heap: a 4-ary heap is half as deep as a binary one, and pos[airport] holds the
+    # airport's slot (-1 when not queued) so an improved route lowers its key in place instead of
+    # pushing a duplicate. The heap never holds more than one entry per airport.
+    pq = np.empty(n, dtype=np.int64)
+    pos = np.full(n, -1, dtype=np.int64)
+    _sift_up4(pq, pos, 0, start)
+    size = 1
+    while size > 0:
+        key, size = _pop4(pq, pos, size)
+        airport = key & _NODE_MASK
+        hops = (key >> _NODE_BITS) & _HOPS_MASK
+        dist = key >> _DIST_SHIFT
+
+        for e in range(adj_idx[airport], adj_idx[airport + 1]):
+            nxt = adj_dest[e]
+            new_dist = dist + adj_dist[e]
+            new_hops = hops + 1
+
+            # Skip if we've seen a better route to this airport before
+            if new_dist > best_dist[nxt]:
+                continue
+            if new_dist == best_dist[nxt] and new_hops >= best_hops[nxt]:
                 continue
-            nxt = edge["dest"]
-            queue.append((nxt, path + [nxt]))
+            best_dist[nxt] = new_dist
+            best_hops[nxt] = new_hops
+            prev[nxt] = airport
+
+            new_key = (new_dist << _DIST_SHIFT) | (new_hops << _NODE_BITS) | nxt
+            if pos[nxt] == -1:
+                _sift_up4(pq, pos, size, new_key)
+                size += 1
+            else:
+                _sift_up4(pq, pos, pos[nxt], new_key)
+
+    return best_dist, prev
+
+
+@_kernel(nogil=True)
+def _all_pairs(rev_idx, rev_src, rev_dist, n):
+    """Compiled all-pairs search, one backward BFS and Dijkstra per destination.
+
+    Searching backward from each destination makes the airport a node was reached from its
+    next hop towards that destination. Returns (next_leg, next_dist, total_dist) n x n tables
+    indexed [end, airport]: the next hop on the fewest-legs and least-distance routes (-1 if
+    none) and the least-distance route length.
+    """
+    next_leg = np.full((n, n), -1, dtype=np.int32)
+    next_dist = np.full((n, n), -1, dtype=np.int32)
+    total_dist = np.zeros((n, n), dtype=np.int32)
 
-    return None
+    for end in range(n):
+        next_leg[end] = _bfs_tree(rev_idx, rev_src, end, n)
 
+        best_dist, prev = _dijkstra(rev_idx, rev_src, rev_dist, end, n)
+        next_dist[end] = prev
+        for airport in range(n):
+            if prev[airport] != -1:
+                total_dist[end, airport] = best_dist[airport]
+
+    return next_leg, next_dist, total_dist
+
+
+def fewest_legs(graph: RouteGraph, start: int, end: int, aircraft: int) -> list[int] | None:
+    """Compute the route with the fewest legs using bidirectional BFS (Breadth-First Search).
+
+    BFS ensures the first path found to the destination is the one with the
+    fewest number of flights (edges) because it explores all nodes at the
+    current depth before moving deeper. Searching forward from the start and
+    backward from the destination at the same time means each side only has
+    to go about half as deep. The search itself runs in the compiled ``_bfs``
+    kernel.
+
+    Args:
+        graph (RouteGraph): The graph containing all routes.
+        start (int): Starting airport id.
+        end (int): Destination airport id.
+        aircraft (int): Aircraft type id to filter flights.
 
-def least_distance(graph: RouteGraph, start: str, end: str, aircraft: str) -> tuple[int, list[str]] | None:
+    Returns:
+        List[int] | None: Sequence of airport ids representing the path, or
+        None if no route exists.
+    """
+    adj_idx, adj_dest, _ = graph.csr(aircraft)
+    rev_idx, rev_src, _ = graph.reverse_csr(aircraft)
+    meet, parent, child = _bfs(adj_idx, adj_dest, rev_idx, rev_src, start, end, len(adj_idx) - 1)
+    if meet == -1:
+        return None
+
+    # Splice the forward half (start -> meet) with the backward half (meet -> end)
+    path = reconstruct_path(parent.tolist(), meet)
+    child = child.tolist()
+    airport = child[meet]
+    while airport != -1:
+        path.append(airport)
+        airport = child[airport]
+    return path
+
+
+def least_distance(graph: RouteGraph, start: int, end: int, aircraft: int) -> tuple[int, list[int]] | None:
     """Compute the route with the least total distance using Dijkstra's algorithm.
 
     Uses a priority queue (heap) to explore routes with the lowest cumulative
     distance first. In case of ties on distance, it prefers routes with fewer
-    hops (legs).
+    hops (legs). The search itself runs in the compiled ``_dijkstra`` kernel,
+    which builds the full tree from the start airport so it can be cached and
+    reused by later queries from the same airport.
 
     Args:
         graph (RouteGraph): Graph containing all routes.
-        start (str): Starting airport code.
-        end (str): Destination airport code.
-        aircraft (str): Aircraft type to filter flights.
+        start (int): Starting airport id.
+        end (int): Destination airport id.
+        aircraft (int): Aircraft type id to filter flights.
 
     Returns:
-        tuple[int, list[str]] | None: Tuple containing total distance and
-        path as a list of airport codes, or None if no route exists.
+        tuple[int, list[int]] | None: Tuple containing total distance and
+        path as a list of airport ids, or None if no route exists.
     """
-    # Priority queue elements: (total_distance, number_of_hops, airport, path)
-    pq = [(0, 0, start, [start])]
-    
-    # store best (distance, hops) seen for airport
-    visited = {}
-
-    while pq:
-        dist, hops, airport, path = heapq.heappop(pq)
-
-        # Return as soon as the destination is reached
-        if airport == end:
-            return dist, path
-
-        # Skip if we've seen a better route to this airport before
-        if airport in visited:
-            best_dist, best_hops = visited[airport]
-            if dist > best_dist:
-                continue
-            if dist == best_dist and hops >= best_hops:
-                continue
-        visited[airport] = (dist, hops)
+    best_dist, prev = graph.search_tree(aircraft, start)
+    if best_dist[end] == _INF:
+        return None
+    return int(best_dist[end]), reconstruct_path(prev.tolist(), end)
 
-        # Explore other routes from current airport that match the aircraft type
-        for edge in graph.graph[airport]:
-            if edge["aircraft"] != aircraft:
-                continue
 
-            nxt = edge["dest"]
-            new_dist = dist + edge["distance"]
-            new_hops = hops + 1
+def all_pairs_routes(graph: RouteGraph, aircraft: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Precompute fewest-legs and least-distance routes between every pair of airports.
 
-            heapq.heappush(pq, (new_dist, new_hops, nxt, path + [nxt]))
+    Rather than full paths, stores a successor table: the next airport to fly to from
+    each airport towards each destination. Only the airports the aircraft flies to or
+    from get a row and column, so the tables are sized by that aircraft's network
+    rather than every airport in the graph. Routes are rebuilt with ``routes_from_tables``.
 
-    return None
+    Args:
+        graph (RouteGraph): Graph containing all routes.
+        aircraft (int): Aircraft type id to filter flights.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (served, next_leg,
+        next_dist, total_dist). served holds the sorted airport ids the tables cover,
+        the tables are indexed [end, airport] by position in served and hold the next
+        hop on the fewest-legs route, on the least-distance route, and its total
+        distance in nautical miles.
+    """
+    adj_idx, adj_dest, adj_dist = graph.csr(aircraft)
+    n = len(adj_idx) - 1
+
+    # Airports with at least one route for this aircraft, numbered 0..m-1 in id order
+    is_served = np.diff(adj_idx) > 0
+    is_served[adj_dest] = True
+    served = np.flatnonzero(is_served)
+    local = np.full(n, -1, dtype=np.int64)
+    local[served] = np.arange(len(served), dtype=np.int64)
 
+    # Unserved airports have no routes, so dropping their empty rows keeps the route order
+    local_idx = np.zeros(len(served) + 1, dtype=np.int64)
+    local_idx[1:] = adj_idx[served + 1]
+    rev_idx, rev_src, rev_dist = invert_csr(local_idx, local[adj_dest], adj_dist)
+    return (served, *_all_pairs(rev_idx, rev_src, rev_dist, len(served)))
 
-def parse_routes_from_string(html_text: str) -> list[dict]:
-    """Parse HTML table data from UPSVAC html data that was retreived with the requests library.
 
-    Extracts departure, destination, aircraft, and distance from the table.
+def follow_next_hops(next_hop: np.ndarray, start: int, end: int) -> list[int] | None:
+    """Rebuild a route by following a successor table from the start to the destination.
 
     Args:
-        html_text (str): HTML content of the UPSVAC all-routes page.
+        next_hop (np.ndarray): Successor table indexed [end, airport], as built by
+            ``all_pairs_routes``.
+        start (int): Starting position in the table.
+        end (int): Destination position in the table.
 
     Returns:
-        List[dict]: List of route dictionaries with keys:
-            - Departure
-            - Destination
-            - Aircraft
-            - Distance
+        list[int] | None: Sequence of table positions representing the path, or
+        None if no route exists.
     """
-    soup = BeautifulSoup(html_text, "html.parser")
-    table = soup.find("table", {"id": "example"})
-    rows = []
+    hops = next_hop[end]
+    if start != end and hops[start] == -1:
+        return None
+    path = [start]
+    airport = start
+    while airport != end:
+        airport = int(hops[airport])
+        path.append(airport)
+    return path
 
-    for tr in table.find("tbody").find_all("tr"):
-        tds = tr.find_all("td")
 
-        # Extract airport codes from strings like "AYPY (Jacksons International Airport)"
-        departure = tds[1].get_text(strip=True).split()[0].split('(')[0]
-        destination = tds[2].get_text(strip=True).split()[0].split('(')[0]
-        aircraft = tds[4].get_text(strip=True)
-        distance = int(tds[6].get_text(strip=True).split('nm')[0].strip())
+def routes_from_tables(tables: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], start: int, end: int) -> tuple[list[int] | None, tuple[int, list[int]] | None]:
+    """Look up the fewest-legs and least-distance routes in precomputed tables.
 
-        rows.append({
-            "Departure": departure,
-            "Destination": destination,
-            "Aircraft": aircraft,
-            "Distance": distance
-        })
+    Args:
+        tables (tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]): Tables built by
+            ``all_pairs_routes`` for the selected aircraft.
+        start (int): Starting airport id.
+        end (int): Destination airport id.
 
-    return rows
+    Returns:
+        tuple[list[int] | None, tuple[int, list[int]] | None]: The same results as
+        ``fewest_legs`` and ``least_distance``.
+    """
+    served, next_leg, next_dist, total_dist = tables
+    if start == end:
+        return [start], (0, [start])
+
+    # Airports the aircraft doesn't serve have no routes at all
+    s = int(np.searchsorted(served, start))
+    e = int(np.searchsorted(served, end))
+    if s == len(served) or served[s] != start or e == len(served) or served[e] != end:
+        return None, None
+
+    fl = follow_next_hops(next_leg, s, e)
+    path = follow_next_hops(next_dist, s, e)
+    if fl is not None:
+        fl = [int(served[i]) for i in fl]
+    ld = None if path is None else (int(total_dist[e, s]), [int(served[i]) for i in path])
+    return fl, ld
+
+def warm_up_kernels() -> None:
+    """Compile the search kernels by running each once on a tiny graph.
+
+    Numba compiles (or loads from its cache) on the first call, so doing this
+    early keeps that delay away from the first route search.
+    """
+    graph = RouteGraph()
+    graph.add_route("A", "B", "", 1)
+    fewest_legs(graph, 0, 1, 0)
+    least_distance(graph, 0, 1, 0)
+    all_pairs_routes(graph, 0)
 
 
-def unique_list(items: list[dict]) -> list[dict]:
-    """Filter a list of routes to remove duplicates and zero-distance entries.
+def parse_routes_from_stream(stream) -> list[dict]:
+    """Parse the UPSVAC routes table while the page is still being read.
 
-    Uses a set to track seen routes based on all relevant keys.
+    Rows are handed over one at a time by lxml as they finish parsing and are
+    cleared straight after, so the full page is never held in memory or
+    decoded to a Python string.
 
     Args:
-        items (list[dict]): Raw list of route dictionaries.
+        stream: Binary file-like object with the UPSVAC all-routes page, such as
+            a streamed ``response.raw``.
 
     Returns:
-        list[dict]: Filtered list with unique, valid-distance routes.
+        List[dict]: List of route dictionaries with keys:
+            - Departure
+            - Destination
+            - Aircraft
+            - Distance
     """
-    seen = set()
-    result = []
-    for item in items:
-        key = (item["Departure"], item["Destination"], item["Aircraft"], item["Distance"])
-        if key not in seen:
-            seen.add(key)
+    rows = []
+    in_table = False
+    in_body = False
 
-            # Ignore invalid routes with 0 distance
-            if item['Distance'] == 0:
-                continue
-            result.append(item)
-    return result
+    for event, elem in etree.iterparse(stream, events=("start", "end"), tag=("table", "tbody", "tr"), html=True):
+        # Only rows inside the <tbody> of <table id="example"> are routes
+        if elem.tag == "table":
+            in_table = event == "start" and elem.get("id") == "example"
+            continue
+        if elem.tag == "tbody":
+            in_body = event == "start" and in_table
+            continue
+        if event != "end" or not in_body:
+            continue
+
+        tds = elem.findall("td")
+        if tds:
+            # Strip each text node before joining, like BeautifulSoup's get_text(strip=True)
+            text = ["".join(t.strip() for t in td.itertext()) for td in tds]
+
+            # Extract airport codes from strings like "AYPY (Jacksons International Airport)"
+            rows.append({
+                "Departure": text[1].split()[0].split('(')[0],
+                "Destination": text[2].split()[0].split('(')[0],
+                "Aircraft": text[4],
+                "Distance": int(text[6].split('nm')[0].strip())
+            })
+
+        # Drop the finished row and any before it to keep memory flat
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
 
+    return rows
 
 
 class ScrollSelect(ctk.CTkToplevel):
@@ -219,6 +668,7 @@ class ScrollSelect(ctk.CTkToplevel):
         self.resizable(False, False)
 
         self.values = sorted(values) # Sort alphabetically
+        self.values_lower = [v.lower() for v in self.values] # Lower-cased once for filtering
         self.callback = callback
 
         # Ensure popup is modal and shifts to front
@@ -240,7 +690,10 @@ class ScrollSelect(ctk.CTkToplevel):
         # Scrollable frame to hold buttons
         self.frame = ctk.CTkScrollableFrame(self)
         self.frame.pack(fill="both", expand=True, padx=10, pady=10)
-        self.buttons: list[ctk.CTkButton] = []
+
+        # Pool of buttons reused for every search, only the first `shown` are packed
+        self.buttons = [ctk.CTkButton(self.frame, text="") for _ in range(40)]
+        self.shown = 0
 
         # Initial load of list
         self.update_list()
@@ -250,17 +703,17 @@ class ScrollSelect(ctk.CTkToplevel):
 
         Filters values by query string and limits display to top 40 results.
         """
-
-        # Clear old buttons if there is any
-        for b in self.buttons:
-            b.destroy()
-        self.buttons.clear()
-
         query = self.search_var.get().lower()
 
         # Filter values
         if query:
-            filtered = [v for v in self.values if query in v.lower()]
+            # Stop scanning once 40 matches are found, no more are ever shown
+            filtered = []
+            for i, vl in enumerate(self.values_lower):
+                if query in vl:
+                    filtered.append(self.values[i])
+                    if len(filtered) == 40:
+                        break
         else:
             # Initial load: show only first 40 airports
             filtered = self.values[:40]
@@ -272,11 +725,17 @@ class ScrollSelect(ctk.CTkToplevel):
             self.info_label.configure(text="")
         filtered = filtered[:40]
 
-        # Create buttons for the items to select
-        for v in filtered:
-            btn = ctk.CTkButton(self.frame, text=v, command=lambda x=v: self.select(x))
-            btn.pack(fill="x", pady=2)
-            self.buttons.append(btn)
+        # Reuse the pooled buttons for the items to select, packing extra ones in order
+        for i, v in enumerate(filtered):
+            btn = self.buttons[i]
+            btn.configure(text=v, command=lambda x=v: self.select(x))
+            if i >= self.shown:
+                btn.pack(fill="x", pady=2)
+
+        # Hide buttons left over from a longer previous list
+        for btn in self.buttons[len(filtered):self.shown]:
+            btn.pack_forget()
+        self.shown = len(filtered)
 
 
     def select(self, value: str):
@@ -300,9 +759,18 @@ class RouteFinderApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
-        self.routes = []
         self.graph = RouteGraph()
 
+        # Reuse one connection pool for requests to UPSVAC
+        self.session = requests.Session()
+
+        # Memoized route results keyed by (start, end, aircraft)
+        self._fl_cache = {}
+        self._ld_cache = {}
+
+        # Precomputed all-pairs successor tables keyed by aircraft id, filled in the background
+        self._tables = {}
+
         # Title
         self.label = ctk.CTkLabel(self, text="UPSVAC Route Finder", font=("Arial", 24))
         self.label.pack(pady=20)
@@ -326,7 +794,7 @@ class RouteFinderApp(ctk.CTk):
         self.button.pack(pady=20)
 
         # Output box for results
-        self.output = ctk.CTkTextbox(self, width=500, height=200,  font=("Courier New", 14), wrap="word")
+        self.output = ctk.CTkTextbox(self, width=500, height=200,  font=("Courier New", 14), wrap="word", state="disabled")
         self.output.pack(pady=10)
 
         # Disable inputs until routes are loaded
@@ -351,29 +819,92 @@ class RouteFinderApp(ctk.CTk):
         self.button.configure(state="normal")
 
 
+    def write_output(self, text: str, clear: bool = False):
+        """Write text to the output box in a single insert.
+
+        The box is kept read-only between updates and only unlocked while writing.
+
+        Args:
+            text (str): Text to append.
+            clear (bool): Whether to remove the previous output first.
+        """
+        self.output.configure(state="normal")
+        if clear:
+            self.output.delete("1.0", "end")
+        self.output.insert("end", text)
+        self.output.configure(state="disabled")
+
     def load_routes(self):
         """Fetch UPSVAC routes, parse them, and build graph.
 
         Runs in a background thread to keep UI responsive.
         """
-        self.output.insert("end", "Loading routes from UPSVAC...\n")
-
-        response = requests.get("https://icrew.upsvac.com/index.php/allroutes")
-        self.routes = unique_list(parse_routes_from_string(response.text))
+        self.write_output("Loading routes from UPSVAC...\n")
+
+        # Compile the search kernels in the background while waiting on the network. Inputs are
+        # not held back for it, a search started before it finishes simply waits for the compile.
+        if _CACHE_KERNELS:
+            threading.Thread(target=warm_up_kernels, daemon=True).start()
+
+        with self.session.get("https://icrew.upsvac.com/index.php/allroutes", stream=True) as response:
+            # Let urllib3 undo any gzip/deflate encoding before lxml reads the raw stream
+            response.raw.decode_content = True
+            routes = parse_routes_from_stream(response.raw)
+
+        # Deduplicate routes, add them to the graph and collect the selection lists in one pass
+        seen = set()
+        aircraft_set = set()
+        airport_set = set()
+        for r in routes:
+            # Intern codes and aircraft names so repeated values share one object and compare by identity
+            dep = sys.intern(r["Departure"])
+            dest = sys.intern(r["Destination"])
+            aircraft = sys.intern(r["Aircraft"])
+            distance = r["Distance"]
+
+            # Ignore duplicate routes and invalid routes with 0 distance
+            key = (dep, dest, aircraft, distance)
+            if not distance or key in seen:
+                continue
+            seen.add(key)
 
-        # Add routes to graph structure for efficient pathfinding
-        for r in self.routes:
-            self.graph.add_route(r["Departure"], r["Destination"], r["Aircraft"], r["Distance"])
+            self.graph.add_route(dep, dest, aircraft, distance)
+            aircraft_set.add(aircraft)
+            airport_set.add(dep)
+            airport_set.add(dest)
 
         # Build selection lists for aircraft and airports
-        self.aircraft_list = sorted(set(r["Aircraft"] for r in self.routes))
-        self.airport_list = sorted(set(r["Departure"] for r in self.routes) |
-                                   set(r["Destination"] for r in self.routes))
+        self.aircraft_list = sorted(aircraft_set)
+        self.airport_list = sorted(airport_set)
 
-        self.output.insert("end", "Routes loaded.\n")
+        # Previously computed routes are no longer valid for the new graph
+        self._fl_cache.clear()
+        self._ld_cache.clear()
+        self._tables.clear()
+
+        self.write_output("Routes loaded.\n")
 
         self.enable_inputs()
 
+        # Searches are run on demand until the tables for an aircraft are ready. As plain Python the
+        # table build would hold the GIL for a long time, so it only runs with compiled kernels.
+        if _CACHE_KERNELS:
+            threading.Thread(target=self.precompute_routes, daemon=True).start()
+
+    def precompute_routes(self):
+        """Build all-pairs successor tables for every aircraft type.
+
+        Runs in a background thread after loading. The compiled search releases the
+        GIL, so aircraft types are processed in parallel on a small thread pool. The
+        pool is capped so only a couple of aircraft types hold their working memory
+        at once.
+        """
+        graph = self.graph
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {a: pool.submit(all_pairs_routes, graph, a) for a in range(len(graph.aircraft_types))}
+            for aircraft_id, future in futures.items():
+                self._tables[aircraft_id] = future.result()
+
     # Selection popups
     def pick_aircraft(self):
         ScrollSelect(self, "Select Aircraft", self.aircraft_list, self.set_aircraft)
@@ -403,49 +934,59 @@ class RouteFinderApp(ctk.CTk):
         start = self.start_var.get()
         end = self.end_var.get()
 
-        self.output.delete("1.0", "end")
-
         if not aircraft or not start or not end:
-            self.output.insert("end", "Please select all fields.\n")
+            self.write_output("Please select all fields.\n", clear=True)
             return
 
-        self.output.insert("end", f"Calculating routes for aircraft: {aircraft}\n")
-        self.output.insert("end", f"From {start} → {end}\n\n")
+        # Collect all output lines and insert them at once, each insert makes the textbox redraw
+        lines = [f"Calculating routes for aircraft: {aircraft}", f"From {start} → {end}", ""]
 
-        # Compute BFS (fewest legs) and Dijkstra (least distance) routes
-        fl = fewest_legs(self.graph, start, end, aircraft)
-        ld = least_distance(self.graph, start, end, aircraft)
+        # Compute BFS (fewest legs) and Dijkstra (least distance) routes, reusing earlier results for the same query
+        graph = self.graph
+        start_id = graph.airport_ids[start]
+        end_id = graph.airport_ids[end]
+        aircraft_id = graph.aircraft_ids[aircraft]
+
+        tables = self._tables.get(aircraft_id)
+        key = (start, end, aircraft)
+        if tables is not None:
+            fl, ld = routes_from_tables(tables, start_id, end_id)
+        else:
+            if key in self._fl_cache:
+                fl = self._fl_cache[key]
+            else:
+                fl = self._fl_cache[key] = fewest_legs(graph, start_id, end_id, aircraft_id)
+            if key in self._ld_cache:
+                ld = self._ld_cache[key]
+            else:
+                ld = self._ld_cache[key] = least_distance(graph, start_id, end_id, aircraft_id)
 
         # --- Fewest Legs Route ---
-        self.output.insert("end", "=== Fewest Legs Route ===\n")
+        lines.append("=== Fewest Legs Route ===")
         if fl:
-            self.output.insert("end", f"Number of Legs: {len(fl)-1}\n")
-            self.output.insert("end", "Route:\n\n")
-            self.output.insert("end"," → ".join(fl) + "\n")
+            lines.append(f"Number of Legs: {len(fl)-1}")
+            lines.append("Route:\n")
+            lines.append(" → ".join(graph.airports[i] for i in fl))
         else:
-            self.output.insert("end", "No route found.\n")
+            lines.append("No route found.")
 
-        self.output.insert("end", "\n")
+        lines.append("")
 
         # --- Least Distance Route ---
-        self.output.insert("end", "=== Least Distance Route ===\n")
+        lines.append("=== Least Distance Route ===")
         if ld:
             total_dist, path = ld
-            self.output.insert("end", f"Total Distance: {total_dist} nm\n")
-            self.output.insert("end", f"Number of Legs: {len(path)-1}\n")
-            self.output.insert("end", "Route:\n\n")
+            lines.append(f"Total Distance: {total_dist} nm")
+            lines.append(f"Number of Legs: {len(path)-1}")
+            lines.append("Route:\n")
             # Show each leg on its own line
             for i in range(len(path)-1):
-                # Find distance for this leg
-                leg_dist = next(
-                    (edge['distance'] for edge in self.graph.graph[path[i]] 
-                    if edge['dest'] == path[i+1] and edge['aircraft'] == aircraft),
-                    0
-                )
-                self.output.insert("end", f"{path[i]} → {path[i+1]} ({leg_dist} nm)\n")
+                leg_dist = graph.edge_weight[(path[i], path[i+1], aircraft_id)]
+                lines.append(f"{graph.airports[path[i]]} → {graph.airports[path[i+1]]} ({leg_dist} nm)")
         else:
-            self.output.insert("end", "No route found.\n")
+            lines.append("No route found.")
 
+        self.write_output("\n".join(lines) + "\n", clear=True)
 
 if __name__ == "__main__":
     app = RouteFinderApp()